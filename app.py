@@ -1,10 +1,11 @@
 # COREP Assistant - Using Groq 
 # Internship Project
 
-from flask import Flask, render_template_string, request, jsonify
+from flask import Flask, render_template_string, request, jsonify, Response
 import os
 from dotenv import load_dotenv
 from template_generator import generate_corep_template, validate_fields
+from export_generator import load_entities, load_reporting_date, export_corep, EXPORT_FORMATS
 import json
 from groq import Groq
 
@@ -376,6 +377,18 @@ def home():
                 flex: 0.3;
             }
             
+            .export-group {
+                display: none;
+                gap: 10px;
+                margin-top: 20px;
+            }
+            
+            .export-group button {
+                background: #28a745;
+                padding: 10px 20px;
+                font-size: 14px;
+            }
+            
             .loading {
                 display: none;
                 text-align: center;
@@ -446,6 +459,12 @@ def home():
                 </div>
                 
                 <div id="result"></div>
+                
+                <div class="export-group" id="exportGroup">
+                    <button onclick="exportResult('csv')">⬇ CSV</button>
+                    <button onclick="exportResult('xlsx')">⬇ XLSX</button>
+                    <button onclick="exportResult('xbrl')">⬇ XBRL (XML)</button>
+                </div>
             </div>
             
             <div class="footer">
@@ -455,6 +474,7 @@ def home():
         
         <script>
             let queryCount = 0;
+            let lastResponse = null;
             
             async function askQuestion() {
                 const question = document.getElementById('question').value;
@@ -468,6 +488,7 @@ def home():
                 
                 loadingDiv.style.display = 'block';
                 resultDiv.innerHTML = '';
+                document.getElementById('exportGroup').style.display = 'none';
                 
                 try {
                     const response = await fetch('/ask', {
@@ -482,6 +503,8 @@ def home():
                     queryCount++;
                     
                     resultDiv.innerHTML = data.formatted_output;
+                    lastResponse = data.response;
+                    document.getElementById('exportGroup').style.display = 'flex';
                     
                 } catch (error) {
                     resultDiv.innerHTML = `
@@ -495,9 +518,46 @@ def home():
                 }
             }
             
+            async function exportResult(format) {
+                if (!lastResponse) return;
+                
+                try {
+                    const response = await fetch('/export/' + format, {
+                        method: 'POST',
+                        headers: {
+                            'Content-Type': 'application/json',
+                        },
+                        body: JSON.stringify({response: lastResponse})
+                    });
+                    
+                    if (!response.ok) {
+                        let message = response.status + ' ' + response.statusText;
+                        try {
+                            message = (await response.json()).error || message;
+                        } catch (e) {
+                            // Not a JSON error body (e.g. an HTML error page)
+                        }
+                        throw new Error(message);
+                    }
+                    
+                    const link = document.createElement('a');
+                    link.href = URL.createObjectURL(await response.blob());
+                    link.download = 'corep_c0100.' + (format === 'xbrl' ? 'xml' : format);
+                    link.click();
+                    
+                    // Revoking straight after click() can cancel the download in some browsers
+                    setTimeout(() => URL.revokeObjectURL(link.href), 1000);
+                    
+                } catch (error) {
+                    alert('Export failed: ' + error.message);
+                }
+            }
+            
             function clearAll() {
                 document.getElementById('question').value = '';
                 document.getElementById('result').innerHTML = '';
+                document.getElementById('exportGroup').style.display = 'none';
+                lastResponse = null;
             }
             
             document.getElementById('question').addEventListener('keydown', function(e) {
@@ -555,6 +615,28 @@ def ask():
         'query_number': query_count
     })
 
+@app.route('/export/<export_format>', methods=['POST'])
+def export(export_format):
+    """Streams the COREP extract (single or multi-entity) as CSV, XLSX or XBRL"""
+    if export_format not in EXPORT_FORMATS:
+        return jsonify({'error': f"Unsupported format '{export_format}'. Use one of: {', '.join(EXPORT_FORMATS)}"}), 400
+    
+    payload = request.get_json(silent=True)
+    try:
+        entities = load_entities(payload)
+        reporting_date = load_reporting_date(payload)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    content_type, extension = EXPORT_FORMATS[export_format]
+    print(f"Exporting {len(entities)} entity extract(s) as {export_format} ✓")
+    
+    return Response(
+        export_corep(entities, export_format, reporting_date),
+        content_type=content_type,
+        headers={'Content-Disposition': f'attachment; filename="corep_c0100.{extension}"'}
+    )
+
 if __name__ == '__main__':
     print("\n" + "="*50)
     print("🏦 COREP Assistant Starting (Groq Version)...")
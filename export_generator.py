@@ -0,0 +1,366 @@
+"""
+Export Generator Module
+Streams COREP form extracts to CSV, XLSX and XBRL-style XML
+"""
+
+import csv
+import io
+import json
+import re
+import zipfile
+from datetime import date, datetime
+from xml.sax.saxutils import escape, quoteattr
+
+from template_generator import AMOUNT_PATTERN, parse_amount
+
+EXPORT_COLUMNS = ['Entity', 'Row', 'Field Name', 'Amount (£000)', 'Rule Reference']
+
+EXPORT_FORMATS = {
+    'csv': ('text/csv; charset=utf-8', 'csv'),
+    'xlsx': ('application/vnd.openxmlformats-officedocument.spreadsheetml.sheet', 'xlsx'),
+    'xbrl': ('application/xml; charset=utf-8', 'xml'),
+}
+
+# Control characters that are illegal in XML 1.0 (tab, newline and CR are allowed)
+XML_ILLEGAL_CHARS = re.compile(r'[\x00-\x08\x0b\x0c\x0e-\x1f\ufffe\uffff]')
+
+# Cells starting with these are run as formulas when a CSV opens in a spreadsheet
+FORMULA_PREFIXES = ('=', '+', '-', '@', '\t', '\r')
+
+# Rows are flushed to the client in batches so each chunk is big enough
+# to be worth a socket write while output memory stays flat
+CHUNK_ROWS = 500
+
+
+def load_entities(payload):
+    """
+    Reads the export request body into (entity, data) pairs
+
+    Accepts either a single result:
+        {"entity": "Bank A", "response": <LLM JSON string or dict>}
+    or a bulk multi-entity result:
+        {"entities": [{"entity": "Bank A", "response": ...}, ...]}
+
+    Returns:
+        List of (entity name, parsed response dict) tuples
+    """
+    if not isinstance(payload, dict):
+        raise ValueError("Request body must be a JSON object")
+
+    if 'entities' in payload:
+        items = payload['entities']
+        if not isinstance(items, list):
+            raise ValueError("'entities' must be a list")
+    else:
+        items = [payload]
+
+    entities = []
+    names = set()
+    for index, item in enumerate(items, start=1):
+        if not isinstance(item, dict) or 'response' not in item:
+            raise ValueError(f"Entity #{index} is missing 'response'")
+
+        data = item['response']
+        if isinstance(data, str):
+            try:
+                data = json.loads(data)
+            except json.JSONDecodeError:
+                raise ValueError(f"Entity #{index} response is not valid JSON")
+        if not isinstance(data, dict):
+            raise ValueError(f"Entity #{index} response must be a JSON object")
+
+        # Checked here so a bad body gets a 400 before streaming starts
+        fields = data.get('required_fields', [])
+        if not isinstance(fields, list) or not all(isinstance(field, dict) for field in fields):
+            raise ValueError(f"Entity #{index} 'required_fields' must be a list of objects")
+
+        # Each entity becomes its own XBRL context, so names must not collide
+        name = str(item.get('entity') or f"Entity {index}")
+        if name in names:
+            raise ValueError(f"Entity #{index} duplicates entity name '{name}'")
+        names.add(name)
+
+        entities.append((name, data))
+
+    return entities
+
+
+def load_reporting_date(payload):
+    """
+    Reads the optional "reporting_date" (YYYY-MM-DD) from the export request body
+
+    Returns:
+        datetime.date, or None if the body does not give one
+    """
+    value = payload.get('reporting_date') if isinstance(payload, dict) else None
+    if value is None:
+        return None
+
+    try:
+        # strptime rather than fromisoformat, which also takes 20251231 and week dates
+        return datetime.strptime(str(value), '%Y-%m-%d').date()
+    except ValueError:
+        raise ValueError("'reporting_date' must be a date in YYYY-MM-DD format")
+
+
+def iter_corep_rows(entities):
+    """
+    Yields one flat row per COREP field, numbered the same way as
+    the HTML extract from generate_corep_template (010, 020, ...)
+    """
+    for entity, data in entities:
+        row_num = 10
+        for field in data.get('required_fields', []):
+            yield (
+                entity,
+                f"{row_num:03d}",
+                str(field.get('field_name', 'N/A')),
+                str(field.get('value', '-')),
+                str(field.get('rule_reference', 'N/A')),
+            )
+            row_num += 10
+
+
+def _xml_text(value):
+    """Escapes text for XML, dropping characters XML 1.0 cannot contain"""
+    return escape(XML_ILLEGAL_CHARS.sub('', value))
+
+
+def _xml_attr(value):
+    """Quotes an attribute value for XML, dropping illegal characters"""
+    return quoteattr(XML_ILLEGAL_CHARS.sub('', value))
+
+
+def _format_amount(value, scale=1):
+    """
+    Normalises an amount with parse_amount, so "£100M" becomes "100000"
+
+    Args:
+        scale: multiplier applied to the £000 amount (1000 gives plain GBP)
+
+    Returns a plain decimal string, or None if not a number
+    """
+    number = parse_amount(value)
+    if number is None:
+        return None
+    return format((number * scale).normalize(), 'f')
+
+
+def _csv_cell(value):
+    """
+    Prefixes formula-like text with ' so spreadsheets show it as text
+
+    Plain numbers and a bare one-character placeholder such as '-' are kept
+    """
+    if len(value) > 1 and value.startswith(FORMULA_PREFIXES) and not AMOUNT_PATTERN.fullmatch(value):
+        return "'" + value
+    return value
+
+
+def stream_csv(rows):
+    """Streams rows as UTF-8 CSV, header first, with amounts normalised to £000"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+
+    # BOM so Excel opens the £ sign correctly
+    buffer.write('\ufeff')
+    writer.writerow(EXPORT_COLUMNS)
+
+    count = 0
+    for entity, row, field_name, value, rule_reference in rows:
+        amount = _format_amount(value)
+        writer.writerow((
+            _csv_cell(entity),
+            row,
+            _csv_cell(field_name),
+            amount if amount is not None else _csv_cell(value),
+            _csv_cell(rule_reference),
+        ))
+        count += 1
+        if count % CHUNK_ROWS == 0:
+            yield buffer.getvalue().encode('utf-8')
+            buffer.seek(0)
+            buffer.truncate()
+
+    yield buffer.getvalue().encode('utf-8')
+
+
+class _ChunkSink(io.RawIOBase):
+    """Write-only stream that hands back whatever zipfile wrote since the last drain"""
+
+    def __init__(self):
+        self.chunks = []
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self.chunks.append(bytes(data))
+        return len(data)
+
+    def drain(self):
+        data = b''.join(self.chunks)
+        self.chunks = []
+        return data
+
+
+_XLSX_STATIC_PARTS = {
+    '[Content_Types].xml': (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+        '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+        '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+        '<Default Extension="xml" ContentType="application/xml"/>'
+        '<Override PartName="/xl/workbook.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+        '<Override PartName="/xl/worksheets/sheet1.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+        '</Types>'
+    ),
+    '_rels/.rels': (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        '<Relationship Id="rId1" '
+        'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+        'Target="xl/workbook.xml"/>'
+        '</Relationships>'
+    ),
+    'xl/workbook.xml': (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+        '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+        'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+        '<sheets><sheet name="C 01.00" sheetId="1" r:id="rId1"/></sheets>'
+        '</workbook>'
+    ),
+    'xl/_rels/workbook.xml.rels': (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        '<Relationship Id="rId1" '
+        'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" '
+        'Target="worksheets/sheet1.xml"/>'
+        '</Relationships>'
+    ),
+}
+
+
+def _xlsx_row(row_index, values):
+    """Builds one <row> of the sheet - numeric amounts become number cells"""
+    cells = []
+    for col_index, value in enumerate(values):
+        ref = f"{chr(ord('A') + col_index)}{row_index}"
+        number = _format_amount(value) if col_index == 3 and row_index > 1 else None
+        if number is not None:
+            cells.append(f'<c r="{ref}"><v>{number}</v></c>')
+        else:
+            cells.append(f'<c r="{ref}" t="inlineStr"><is><t xml:space="preserve">{_xml_text(value)}</t></is></c>')
+    return f'<row r="{row_index}">{"".join(cells)}</row>'
+
+
+def stream_xlsx(rows):
+    """
+    Streams rows as a single-sheet XLSX workbook
+
+    The zip is written to a non-seekable sink, so zipfile uses data
+    descriptors and each compressed chunk can be sent as soon as it exists.
+    No third-party spreadsheet library is needed.
+    """
+    sink = _ChunkSink()
+
+    with zipfile.ZipFile(sink, 'w', compression=zipfile.ZIP_DEFLATED) as workbook:
+        for name, content in _XLSX_STATIC_PARTS.items():
+            workbook.writestr(name, content)
+        yield sink.drain()
+
+        with workbook.open('xl/worksheets/sheet1.xml', 'w') as sheet:
+            sheet.write((
+                '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+                '<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+                '<sheetData>'
+                + _xlsx_row(1, EXPORT_COLUMNS)
+            ).encode('utf-8'))
+
+            batch = []
+            row_index = 1
+            for row in rows:
+                row_index += 1
+                batch.append(_xlsx_row(row_index, row))
+                if len(batch) == CHUNK_ROWS:
+                    sheet.write(''.join(batch).encode('utf-8'))
+                    batch = []
+                    yield sink.drain()
+
+            sheet.write((''.join(batch) + '</sheetData></worksheet>').encode('utf-8'))
+
+    yield sink.drain()
+
+
+def stream_xbrl(rows, reporting_date):
+    """
+    Streams rows as an XBRL-style instance document
+
+    One context per entity, all as at reporting_date; each field becomes a
+    corep fact named after its C 01.00 row code. XBRL has no scale, so the
+    £000 amounts are converted to GBP and reported with decimals="-3"
+    (known to the thousand). Fields without a numeric amount
+    (e.g. "User to provide") are reported as nil facts.
+    This is XBRL-like for hand-off to submission tooling, not a validated
+    EBA taxonomy filing.
+    """
+    yield (
+        '<?xml version="1.0" encoding="UTF-8"?>\n'
+        '<xbrli:xbrl xmlns:xbrli="http://www.xbrl.org/2003/instance" '
+        'xmlns:iso4217="http://www.xbrl.org/2003/iso4217" '
+        'xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance" '
+        'xmlns:corep="urn:corep-assistant:c_01.00">\n'
+        '  <xbrli:unit id="GBP"><xbrli:measure>iso4217:GBP</xbrli:measure></xbrli:unit>\n'
+    ).encode('utf-8')
+
+    period = f'<xbrli:period><xbrli:instant>{reporting_date.isoformat()}</xbrli:instant></xbrli:period>'
+    contexts = {}
+    batch = []
+    for entity, row, field_name, value, rule_reference in rows:
+        if entity not in contexts:
+            context_id = f"ctx_{len(contexts) + 1}"
+            contexts[entity] = context_id
+            batch.append(
+                f'  <xbrli:context id="{context_id}">'
+                f'<xbrli:entity><xbrli:identifier scheme="urn:corep-assistant:entity">'
+                f'{_xml_text(entity)}</xbrli:identifier></xbrli:entity>{period}</xbrli:context>\n'
+            )
+
+        number = _format_amount(value, scale=1000)
+        if number is None:
+            attrs, fact_value = 'xsi:nil="true"', ''
+        else:
+            # Amounts given below the thousand are kept exact rather than rounded
+            attrs, fact_value = f'decimals="{"INF" if "." in number else "-3"}"', number
+        batch.append(
+            f'  <corep:C_01.00_r{row} contextRef="{contexts[entity]}" unitRef="GBP" {attrs} '
+            f'label={_xml_attr(field_name)} ruleReference={_xml_attr(rule_reference)}>'
+            f'{fact_value}</corep:C_01.00_r{row}>\n'
+        )
+
+        if len(batch) >= CHUNK_ROWS:
+            yield ''.join(batch).encode('utf-8')
+            batch = []
+
+    batch.append('</xbrli:xbrl>\n')
+    yield ''.join(batch).encode('utf-8')
+
+
+def export_corep(entities, export_format, reporting_date=None):
+    """
+    Returns a generator of byte chunks for the requested format
+
+    Args:
+        entities: list from load_entities
+        export_format: 'csv', 'xlsx' or 'xbrl'
+        reporting_date: XBRL reference date, defaults to today
+    """
+    rows = iter_corep_rows(entities)
+    if export_format == 'csv':
+        return stream_csv(rows)
+    if export_format == 'xlsx':
+        return stream_xlsx(rows)
+    if export_format == 'xbrl':
+        return stream_xbrl(rows, reporting_date or date.today())
+    raise ValueError(f"Unsupported export format: {export_format}")
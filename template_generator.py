@@ -3,6 +3,13 @@ Template Generator Module
 Generates COREP form extracts from LLM output
 """
 
+import re
+from decimal import Decimal
+
+# Plain decimal only - no exponents, underscores, nan or inf
+AMOUNT_PATTERN = re.compile(r'[+-]?(\d+(\.\d*)?|\.\d+)')
+
+
 def generate_corep_template(llm_response):
     """
     Takes the LLM JSON response and formats it as a COREP-like table
@@ -75,6 +82,27 @@ def generate_corep_template(llm_response):
         return f"<p style='color: red;'>Error generating template: {str(e)}</p>"
 
 
+def parse_amount(value):
+    """
+    Parses a COREP amount into £000
+
+    Commas and £ signs are ignored, and an M suffix means millions
+    (x1000), the same convention as the fallback calculations.
+
+    Returns:
+        Decimal amount in £000, or None if the value is not a number
+    """
+    text = str(value).strip().replace(',', '').replace('£', '')
+    scale = 1
+    if text.endswith('M'):
+        text = text[:-1].strip()
+        scale = 1000
+
+    if not AMOUNT_PATTERN.fullmatch(text):
+        return None
+    return Decimal(text) * scale
+
+
 def validate_fields(fields):
     """
     Basic validation rules for COREP fields
@@ -88,17 +116,16 @@ def validate_fields(fields):
         
         # Check if value is numeric where expected
         if value and value != '-':
-            try:
-                num_val = float(value.replace(',', '').replace('£', '').replace('M', ''))
-                
+            num_val = parse_amount(value)
+            
+            if num_val is None:
+                errors.append(f"Error: {field_name} has non-numeric value: {value}")
+            else:
                 # Basic business rules
                 if 'deduction' in field_name.lower() and num_val > 0:
                     errors.append(f"Warning: {field_name} should typically be negative (deduction)")
                 
                 if 'capital' in field_name.lower() and num_val < 0:
                     errors.append(f"Warning: {field_name} is negative - please verify")
-                    
-            except ValueError:
-                errors.append(f"Error: {field_name} has non-numeric value: {value}")
     
     return errors
\ No newline at end of file
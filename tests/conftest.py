@@ -0,0 +1,7 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# app.py exits at import without a key; the export tests never call Groq
+os.environ.setdefault('GROQ_API_KEY', 'test-key')
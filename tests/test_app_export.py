@@ -0,0 +1,32 @@
+import pytest
+
+pytest.importorskip('flask')
+pytest.importorskip('groq')
+
+from app import app
+
+
+@pytest.fixture
+def client():
+    return app.test_client()
+
+
+def test_export_streams_csv(client):
+    response = client.post('/export/csv', json={
+        "response": {"required_fields": [{"field_name": "Ordinary Shares", "value": "£100M"}]},
+    })
+    assert response.status_code == 200
+    assert response.headers['Content-Disposition'] == 'attachment; filename="corep_c0100.csv"'
+    assert b'Ordinary Shares,100000' in response.data
+
+
+@pytest.mark.parametrize("url, body, message", [
+    ('/export/pdf', {"response": {}}, "Unsupported format"),
+    ('/export/csv', None, "must be a JSON object"),
+    ('/export/csv', {"response": {"required_fields": None}}, "list of objects"),
+    ('/export/xbrl', {"response": {}, "reporting_date": "yesterday"}, "YYYY-MM-DD"),
+])
+def test_export_bad_requests(client, url, body, message):
+    response = client.post(url, json=body) if body is not None else client.post(url, data='not json')
+    assert response.status_code == 400
+    assert message in response.get_json()['error']
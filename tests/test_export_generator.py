@@ -0,0 +1,157 @@
+import csv
+import io
+import json
+import zipfile
+from datetime import date
+from decimal import Decimal
+from xml.dom import minidom
+
+import pytest
+
+from export_generator import export_corep, load_entities, load_reporting_date
+from template_generator import parse_amount, validate_fields
+
+FIELDS = [
+    {"field_name": "Ordinary Shares", "value": "£100M", "rule_reference": "RULE 1"},
+    {"field_name": "Intangible Assets (deduction)", "value": "-5,000", "rule_reference": "RULE 2"},
+    {"field_name": "Retained Earnings", "value": "User to provide", "rule_reference": "RULE 1"},
+]
+
+
+def export_bytes(entities, export_format, reporting_date=None):
+    return b''.join(export_corep(entities, export_format, reporting_date))
+
+
+# --- load_entities ---
+
+def test_load_entities_single_with_json_string():
+    entities = load_entities({"entity": "Bank A", "response": json.dumps({"required_fields": FIELDS})})
+    assert entities == [("Bank A", {"required_fields": FIELDS})]
+
+
+def test_load_entities_bulk_defaults_names():
+    entities = load_entities({"entities": [
+        {"entity": "Bank A", "response": {"required_fields": FIELDS}},
+        {"response": {}},
+    ]})
+    assert [name for name, _ in entities] == ["Bank A", "Entity 2"]
+
+
+@pytest.mark.parametrize("payload, message", [
+    (None, "must be a JSON object"),
+    ({"entities": {}}, "must be a list"),
+    ({"entities": ["x"]}, "missing 'response'"),
+    ({"entity": "A"}, "missing 'response'"),
+    ({"response": "{not json"}, "not valid JSON"),
+    ({"response": "[1, 2]"}, "must be a JSON object"),
+    ({"response": {"required_fields": None}}, "list of objects"),
+    ({"response": {"required_fields": ["x"]}}, "list of objects"),
+    ({"entities": [{"entity": "A", "response": {}}, {"entity": "A", "response": {}}]}, "duplicates entity name"),
+])
+def test_load_entities_errors(payload, message):
+    with pytest.raises(ValueError, match=message):
+        load_entities(payload)
+
+
+def test_load_reporting_date():
+    assert load_reporting_date({"reporting_date": "2025-12-31"}) == date(2025, 12, 31)
+    assert load_reporting_date({}) is None
+    for value in ("31/12/2025", "20251231", "2025-W01-1"):
+        with pytest.raises(ValueError, match="YYYY-MM-DD"):
+            load_reporting_date({"reporting_date": value})
+
+
+# --- amount parsing ---
+
+@pytest.mark.parametrize("value, expected", [
+    ("£100M", Decimal("100000")),
+    ("-£5M", Decimal("-5000")),
+    ("1,250", Decimal("1250")),
+    ("0.00001", Decimal("0.00001")),
+    ("1_000", None),
+    ("1e5", None),
+    ("nan", None),
+    ("User to provide", None),
+])
+def test_parse_amount(value, expected):
+    assert parse_amount(value) == expected
+
+
+def test_validate_fields_uses_shared_parsing():
+    errors = validate_fields([
+        {"field_name": "Intangible Assets (deduction)", "value": "£5M"},
+        {"field_name": "Other", "value": "1_000"},
+    ])
+    assert errors == [
+        "Warning: Intangible Assets (deduction) should typically be negative (deduction)",
+        "Error: Other has non-numeric value: 1_000",
+    ]
+
+
+# --- streamers ---
+
+def test_csv_round_trip_and_formula_neutralising():
+    fields = FIELDS + [{"field_name": "=HYPERLINK(\"http://x\")", "value": "@SUM(A1)", "rule_reference": "-5"}, {"field_name": "No value"}]
+    output = export_bytes([("Bank A", {"required_fields": fields})], 'csv')
+
+    assert output.startswith(b'\xef\xbb\xbf')
+    rows = list(csv.reader(io.StringIO(output.decode('utf-8-sig'))))
+    assert rows[0] == ['Entity', 'Row', 'Field Name', 'Amount (£000)', 'Rule Reference']
+    assert rows[1] == ['Bank A', '010', 'Ordinary Shares', '100000', 'RULE 1']
+    assert rows[2][3] == '-5000'
+    assert rows[3][3] == 'User to provide'
+    assert rows[4] == ['Bank A', '040', "'=HYPERLINK(\"http://x\")", "'@SUM(A1)", '-5']
+    assert rows[5] == ['Bank A', '050', 'No value', '-', 'N/A']
+
+
+def test_xlsx_round_trip():
+    fields = FIELDS + [{"field_name": "bad\x01name", "value": "1", "rule_reference": " spaced "}]
+    output = export_bytes([("Bank A", {"required_fields": fields})], 'xlsx')
+
+    workbook = zipfile.ZipFile(io.BytesIO(output))
+    assert workbook.testzip() is None
+    sheet = minidom.parseString(workbook.read('xl/worksheets/sheet1.xml'))
+    rows = sheet.getElementsByTagName('row')
+    assert len(rows) == len(fields) + 1
+
+    amount = rows[1].getElementsByTagName('c')[3]
+    assert not amount.hasAttribute('t')
+    assert amount.getElementsByTagName('v')[0].firstChild.data == '100000'
+    assert 'badname' in rows[4].toxml()
+
+    rule = rows[4].getElementsByTagName('t')[-1]
+    assert rule.getAttribute('xml:space') == 'preserve'
+    assert rule.firstChild.data == ' spaced '
+
+
+def test_xbrl_round_trip():
+    entities = [
+        ("Bank A", {"required_fields": FIELDS}),
+        ("Bank\x02 B", {"required_fields": [{"field_name": "x", "value": "0.00001", "rule_reference": "r\x01"}]}),
+    ]
+    document = minidom.parseString(export_bytes(entities, 'xbrl', date(2025, 12, 31)))
+
+    contexts = document.getElementsByTagName('xbrli:context')
+    assert len(contexts) == 2
+    instants = [node.firstChild.data for node in document.getElementsByTagName('xbrli:instant')]
+    assert instants == ['2025-12-31', '2025-12-31']
+
+    shares = document.getElementsByTagName('corep:C_01.00_r010')[0]
+    deduction = document.getElementsByTagName('corep:C_01.00_r020')[0]
+    retained = document.getElementsByTagName('corep:C_01.00_r030')[0]
+    assert shares.firstChild.data == '100000000'
+    assert shares.getAttribute('unitRef') == 'GBP'
+    assert shares.getAttribute('decimals') == '-3'
+    assert deduction.firstChild.data == '-5000000'
+    assert retained.getAttribute('xsi:nil') == 'true'
+    assert retained.firstChild is None
+
+    small = document.getElementsByTagName('corep:C_01.00_r010')[1]
+    assert small.firstChild.data == '0.01'
+    assert small.getAttribute('decimals') == 'INF'
+    assert small.getAttribute('contextRef') == 'ctx_2'
+
+
+def test_export_unknown_format():
+    with pytest.raises(ValueError, match="Unsupported export format"):
+        export_corep([], 'pdf')